@@ -1,31 +1,87 @@
 # backend.py
-from fact_checker import get_web_snippets, verify_claim
+import asyncio
+import functools
+import os
+import threading
 
-def check_fact(statement: str) -> dict:
-    # Step 1: Search for evidence
-    search_query = f'{statement} site:snopes.com OR site:politifact.com OR site:bbc.com OR site:reuters.com'
-    snippets = get_web_snippets(search_query, num_results=6)
+from fact_checker import (get_web_snippets_async, verify_claim_stream, verify_claim_parallel,
+                          embed_text, dedupe_snippets, build_query, get_genai)
+from claim_cache import ExactCache, extract_entities, make_semantic_cache
+from prewarm import load_index, wiki_snippets
 
-    if not snippets:
-        return {
-            "verdict": "Unclear",
-            "confidence": 0.0,
-            "summary": "No evidence found.",
-            "evidence": []
-        }
+# Repeat clicks on the same claim (e.g. the sidebar examples) are answered from here
+# without any embedding, search or Gemini call.
+_exact_cache = ExactCache()
+# Near-duplicate claims ("The capital of France is Paris" / "France's capital is Paris")
+# are answered from here instead of re-running search + Gemini.
+_semantic_cache = make_semantic_cache()
+# FACT_CHECKER_PER_SNIPPET=1 judges each snippet in its own parallel Gemini call and votes,
+# instead of one streamed call over all the evidence (which lets the UI show the explanation
+# as it is written).
+PER_SNIPPET_JUDGING = os.getenv("FACT_CHECKER_PER_SNIPPET", "0") == "1"
 
-    # Step 2: Verify claim with Gemini
-    result = verify_claim(statement, snippets)
+# All backend coroutines run on one long-lived event loop in a daemon thread. The Gemini SDK
+# caches its async gRPC client for the whole process, and that client only works on the loop it
+# was created on, so a fresh asyncio.run() per check would break every check after the first.
+_loop = None
+_loop_lock = threading.Lock()
+_DONE = object()
 
-    # Step 3: Map fact_checker result to frontend expected format
-    if "error" in result:
-        return {
-            "verdict": "Unclear",
-            "confidence": 0.0,
-            "summary": result["error"],
-            "evidence": []
-        }
+def _backend_loop():
+    global _loop
+    with _loop_lock:
+        if _loop is None:
+            _loop = asyncio.new_event_loop()
+            threading.Thread(target=_loop.run_forever, name="fact-checker-loop", daemon=True).start()
+    return _loop
 
+async def _on_backend_loop(coro):
+    """Run coro on the backend loop and await its result from whatever loop the caller is on."""
+    return await asyncio.wrap_future(asyncio.run_coroutine_threadsafe(coro, _backend_loop()))
+
+async def _next(gen):
+    try:
+        return await gen.__anext__()
+    except StopAsyncIteration:
+        return _DONE
+
+@functools.lru_cache(None)
+def _wiki_index():
+    """Pre-built Wikipedia chunks (python prewarm.py), loaded on first use; None if not built."""
+    return load_index()
+
+def _context_entities(context) -> frozenset:
+    """Entities of the context chain (the claims checked just before this one)."""
+    return frozenset().union(*[extract_entities(c) for c in context])
+
+def _exact_context(entities: frozenset, context: frozenset) -> frozenset:
+    """Claims without entities of their own are follow-ups, so their exact-cache key includes
+       the context chain; self-contained claims are cached regardless of what came before.
+    """
+    return frozenset() if entities else context
+
+def _lookup(statement: str, entities: frozenset, context: frozenset):
+    """Return (cached_result_or_None, claim_embedding_or_None)."""
+    cached = _exact_cache.get(statement, _exact_context(entities, context))
+    if cached is not None:
+        return cached, None
+    # Everything past the exact cache needs Gemini; a missing API key is raised here so callers
+    # (e.g. the Streamlit demo fallback) see it before any search is done
+    get_genai()
+    try:
+        embedding = embed_text(statement)
+    except Exception as e:
+        print(f"[warning] Could not embed claim, skipping cache: {e}")
+        return None, None
+    return _semantic_cache.get(embedding, entities, context), embedding
+
+def _remember(statement: str, response: dict, embedding, entities: frozenset, context: frozenset):
+    _exact_cache.put(statement, response, _exact_context(entities, context))
+    if embedding is not None:
+        _semantic_cache.put(embedding, response, entities, context)
+
+def _to_frontend(result: dict, snippets: list) -> dict:
+    """Map a fact_checker result to the format the frontend expects."""
     return {
         "verdict": (
             "True" if result.get("verdict") == "SUPPORTED" else
@@ -34,5 +90,89 @@ def check_fact(statement: str) -> dict:
         ),
         "confidence": (result.get("confidence", 0) / 100),
         "summary": result.get("explanation", ""),
-        "evidence": [{"source": "Web", "snippet": s["text"], "url": s["url"]} for s in snippets]
+        "evidence": [{"source": s.get("source", "Web"), "snippet": s["text"], "url": s["url"]} for s in snippets]
     }
+
+async def _check_fact_stream(statement: str, result: dict, context=()):
+    """The pipeline behind check_fact_stream; must run on the backend loop."""
+    # Step 0: Reuse a previous result — exact claim first, then a semantically equivalent one
+    entities = extract_entities(statement)
+    context = _context_entities(context)
+    # embedding is a network call and the caches do file/Redis I/O; keep them off the event loop
+    cached, embedding = await asyncio.to_thread(_lookup, statement, entities, context)
+    if cached is not None:
+        result.update(cached)
+        yield cached.get("summary", "")
+        return
+
+    # Step 1: Use pre-warmed Wikipedia evidence if the claim is close to it, otherwise search the web
+    snippets = wiki_snippets(_wiki_index(), embedding) if embedding is not None else []
+    if not snippets:
+        snippets = dedupe_snippets(await get_web_snippets_async(build_query(statement), num_results=6))
+
+    if not snippets:
+        result.update({
+            "verdict": "Unclear",
+            "confidence": 0.0,
+            "summary": "No evidence found.",
+            "evidence": []
+        })
+        return
+
+    # Step 2: Verify claim with Gemini, passing the explanation through as it streams
+    if PER_SNIPPET_JUDGING:
+        verdict = await verify_claim_parallel(statement, snippets)
+        if verdict.get("explanation"):
+            yield verdict["explanation"]
+    else:
+        verdict = {}
+        async for text in verify_claim_stream(statement, snippets, result=verdict):
+            yield text
+
+    # Step 3: Map fact_checker result to frontend expected format
+    if "error" in verdict:
+        result.update({
+            "verdict": "Unclear",
+            "confidence": 0.0,
+            "summary": verdict["error"],
+            "evidence": []
+        })
+        return
+
+    response = _to_frontend(verdict, snippets)
+    result.update(response)
+    # Only real verdicts are cached; empty searches, API errors and unparseable replies
+    # (raw_response) are retried next time
+    if "verdict" not in verdict:
+        return
+    await asyncio.to_thread(_remember, statement, response, embedding, entities, context)
+
+async def check_fact_stream(statement: str, result: dict, context=()):
+    """Async generator yielding the summary while Gemini writes it.
+       When it is exhausted, `result` holds the same dict check_fact returns.
+       `context` is the list of claims checked just before this one (most recent first);
+       it only decides whether a semantically similar cached result may be reused.
+       Can be consumed from any event loop; the work itself runs on the backend loop.
+    """
+    gen = _check_fact_stream(statement, result, context)
+    try:
+        while True:
+            text = await _on_backend_loop(_next(gen))
+            if text is _DONE:
+                return
+            yield text
+    finally:
+        await _on_backend_loop(gen.aclose())
+
+async def _collect(statement: str, context=()) -> dict:
+    result = {}
+    async for _ in _check_fact_stream(statement, result, context):
+        pass
+    return result
+
+async def check_fact_async(statement: str, context=()) -> dict:
+    """Awaitable check_fact, for callers that already run an event loop."""
+    return await _on_backend_loop(_collect(statement, context))
+
+def check_fact(statement: str, context=()) -> dict:
+    return asyncio.run_coroutine_threadsafe(_collect(statement, context), _backend_loop()).result()
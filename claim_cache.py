@@ -0,0 +1,317 @@
+# claim_cache.py
+from __future__ import annotations
+
+import copy
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from typing import TYPE_CHECKING, NamedTuple, Protocol
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def normalize_claim(claim: str) -> str:
+    """Lowercase and collapse whitespace so trivially different spellings share a key."""
+    return " ".join(claim.lower().split())
+
+
+class ExactCache:
+    """Exact-match layer in front of the semantic cache: sha256 of the normalized claim -> result.
+       Kept as an LRU in memory and written through to a JSON file so hits survive app restarts.
+    """
+
+    def __init__(self, path: str = os.path.expanduser("~/.cache/fact_checker.json"),
+                 ttl: float = 3600, max_entries: int = 512):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # key -> {"response": ..., "timestamp": ...}
+        try:
+            with open(self.path, encoding="utf-8") as f:
+                self._entries.update(json.load(f))
+        except (OSError, ValueError):
+            pass
+
+    @staticmethod
+    def key(claim: str, context: frozenset = frozenset()) -> str:
+        """`context` (entities of the preceding claims) is part of the key for follow-up claims
+           that only make sense in context, e.g. "The vaccine is safe".
+        """
+        text = normalize_claim(claim)
+        if context:
+            text += "\n" + " ".join(sorted(context))
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get(self, claim: str, context: frozenset = frozenset()):
+        """Return a copy of the cached response for this exact claim (in this context), or None."""
+        key = self.key(claim, context)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            if time.time() - entry["timestamp"] > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return copy.deepcopy(entry["response"])
+
+    def put(self, claim: str, response: dict, context: frozenset = frozenset()):
+        with self._lock:
+            key = self.key(claim, context)
+            self._entries[key] = {"response": copy.deepcopy(response), "timestamp": time.time()}
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._save()
+
+    def _save(self):
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp = self.path + ".tmp"
+            with open(tmp, "w", encoding="utf-8") as f:
+                json.dump(self._entries, f)
+            os.replace(tmp, self.path)
+        except OSError as e:
+            print(f"[warning] Could not write exact-match cache to {self.path}: {e}")
+
+
+# Proper nouns / acronyms (capitalized tokens) and numbers
+_ENTITY_RE = re.compile(r"\b(?:[A-Z][\w-]*|\d[\d.,]*\d|\d)")
+# Capitalized only by grammar, wherever they appear
+_NOT_ENTITIES = {
+    "the", "a", "an", "this", "that", "these", "those", "it", "its", "he", "she", "they",
+    "we", "i", "you", "there", "in", "on", "at", "of", "and", "or", "but", "if", "all",
+    "some", "most", "many", "no", "not", "every",
+}
+
+def _sentence_start(text: str, pos: int) -> bool:
+    before = text[:pos].rstrip()
+    return not before or before[-1] in ".!?"
+
+def extract_entities(text: str) -> frozenset:
+    """Cheap entity set for a claim: lowercased proper nouns, acronyms and numbers.
+       The first word of a sentence is capitalized anyway, so it only counts if it is an
+       acronym or contains a digit (or shows up capitalized again later in the claim).
+    """
+    matches = list(_ENTITY_RE.finditer(text))
+    counts = Counter(m.group(0) for m in matches)
+    entities = set()
+    for match in matches:
+        tok = match.group(0)
+        if tok.lower() in _NOT_ENTITIES:
+            continue
+        if (_sentence_start(text, match.start()) and counts[tok] == 1
+                and not any(c.isdigit() for c in tok) and not (len(tok) > 1 and tok.isupper())):
+            continue
+        entities.add(tok.lower())
+    return frozenset(entities)
+
+def jaccard(a: frozenset, b: frozenset) -> float:
+    if not a and not b:
+        return 1.0
+    return len(a & b) / len(a | b)
+
+
+class CacheEntry(NamedTuple):
+    embedding: np.ndarray   # L2-normalized claim embedding
+    response: dict          # backend.check_fact result for that claim
+    timestamp: float        # time.time() when the result was stored
+    entities: frozenset = frozenset()  # extract_entities(claim)
+    context: frozenset = frozenset()   # entities of the claims checked just before it
+
+
+class CacheBackend(Protocol):
+    """Where cache entries live between processes (the in-memory list is always the working copy)."""
+
+    def sync(self) -> tuple:
+        """Return (entries added by other processes since the last sync, timestamp of the
+           oldest entry still stored); local entries older than that have been evicted.
+        """
+        ...
+
+    def add(self, entry: CacheEntry, ttl: float, max_entries: int) -> None: ...
+
+
+class MemoryBackend:
+    """Default backend: nothing is persisted, the cache lives as long as the process."""
+
+    def sync(self) -> tuple:
+        return [], 0.0
+
+    def add(self, entry: CacheEntry, ttl: float, max_entries: int) -> None:
+        pass
+
+
+class RedisBackend:
+    """Shares entries between app processes: one JSON value per entry in a hash and a sorted
+       set of timestamps, used both for expiry/eviction and to fetch only the entries added
+       since the last sync.
+    """
+
+    # Re-read ids this far behind the newest one seen, in case another process's clock lags
+    # or its write lands after one with a later timestamp
+    SYNC_SLACK = 5.0
+
+    def __init__(self, url: str, prefix: str = "fact_checker:semantic_cache"):
+        import redis  # optional dependency, only needed when REDIS_URL is set
+        self.client = redis.Redis.from_url(url, decode_responses=True)
+        self.entries_key = f"{prefix}:entries"
+        self.times_key = f"{prefix}:times"
+        self._since = float("-inf")  # lower bound of the timestamps fetched by the next sync
+        self._seen = {}              # id -> timestamp of entries this process already has
+
+    def sync(self) -> tuple:
+        try:
+            pipe = self.client.pipeline()
+            pipe.zrangebyscore(self.times_key, self._since, "+inf", withscores=True)
+            pipe.zrange(self.times_key, 0, 0, withscores=True)
+            recent, oldest = pipe.execute()
+            new_ids = [entry_id for entry_id, _ in recent if entry_id not in self._seen]
+            values = self.client.hmget(self.entries_key, new_ids) if new_ids else []
+        except Exception as e:
+            print(f"[warning] Could not sync semantic cache from Redis: {e}")
+            return [], 0.0
+        import numpy as np
+
+        entries = []
+        for value in values:
+            if value is None:  # evicted between the two calls
+                continue
+            d = json.loads(value)
+            entries.append(CacheEntry(np.asarray(d["embedding"], dtype=np.float32), d["response"],
+                                      d["timestamp"], frozenset(d["entities"]), frozenset(d["context"])))
+        self._seen.update(recent)
+        if recent:
+            self._since = max(self._since, recent[-1][1] - self.SYNC_SLACK)
+            self._seen = {i: t for i, t in self._seen.items() if t >= self._since}
+        return sorted(entries, key=lambda e: e.timestamp), (oldest[0][1] if oldest else float("inf"))
+
+    def add(self, entry: CacheEntry, ttl: float, max_entries: int) -> None:
+        value = json.dumps({
+            "embedding": entry.embedding.tolist(),
+            "response": entry.response,
+            "timestamp": entry.timestamp,
+            "entities": sorted(entry.entities),
+            "context": sorted(entry.context),
+        })
+        entry_id = uuid.uuid4().hex
+        self._seen[entry_id] = entry.timestamp  # already in this process's working copy
+        try:
+            pipe = self.client.pipeline()
+            pipe.hset(self.entries_key, entry_id, value)
+            pipe.zadd(self.times_key, {entry_id: entry.timestamp})
+            pipe.execute()
+            # Drop expired entries, then the oldest ones beyond max_entries
+            stale = self.client.zrangebyscore(self.times_key, "-inf", time.time() - ttl)
+            excess = self.client.zcard(self.times_key) - len(stale) - max_entries
+            if excess > 0:
+                stale += self.client.zrange(self.times_key, len(stale), len(stale) + excess - 1)
+            if stale:
+                pipe = self.client.pipeline()
+                pipe.hdel(self.entries_key, *stale)
+                pipe.zrem(self.times_key, *stale)
+                pipe.execute()
+        except Exception as e:
+            print(f"[warning] Could not save semantic cache entry to Redis: {e}")
+
+
+class SemanticCache:
+    """Returns a stored fact-check result when a new claim is close enough in meaning
+       (cosine similarity of the embeddings) to one that was already checked.
+
+       Embeddings alone blur context ("The vaccine is safe" is close to any vaccine claim),
+       so a similar entry also has to share most of the claim's entities. A claim with no
+       entities of its own is treated as a follow-up and must come from a matching
+       context chain (the entities of the previous few claims), as in MeanCache.
+    """
+
+    def __init__(self, backend: CacheBackend = None, threshold: float = 0.92,
+                 ttl: float = 3600, max_entries: int = 1024, min_overlap: float = 0.5):
+        self.backend = backend or MemoryBackend()
+        self.threshold = threshold
+        self.min_overlap = min_overlap
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries = []    # oldest use first, most recent use last
+        self._matrix = None   # stacked embeddings, rebuilt lazily after changes
+        self._refresh()
+
+    def _refresh(self):
+        """Pick up entries other processes have added and drop the ones they evicted."""
+        added, oldest = self.backend.sync()
+        kept = [e for e in self._entries if e.timestamp >= oldest]
+        if added or len(kept) != len(self._entries):
+            self._entries = kept + added
+            del self._entries[:-self.max_entries]
+            self._matrix = None
+
+    def _drop_expired(self):
+        cutoff = time.time() - self.ttl
+        fresh = [e for e in self._entries if e.timestamp >= cutoff]
+        if len(fresh) != len(self._entries):
+            self._entries = fresh
+            self._matrix = None
+
+    def _matches(self, entry: CacheEntry, entities: frozenset, context: frozenset) -> bool:
+        if jaccard(entities, entry.entities) < self.min_overlap:
+            return False
+        if not entities:
+            return jaccard(context, entry.context) >= self.min_overlap
+        return True
+
+    def get(self, embedding: np.ndarray, entities: frozenset = frozenset(),
+            context: frozenset = frozenset()):
+        """Return the cached response for the most similar fresh claim that also passes the
+           entity/context checks, or None on a miss.
+        """
+        import numpy as np
+
+        with self._lock:
+            self._refresh()
+            self._drop_expired()
+            if not self._entries:
+                return None
+            if self._matrix is None:
+                self._matrix = np.vstack([e.embedding for e in self._entries])
+            sims = self._matrix @ embedding
+            for i in np.argsort(-sims):
+                if sims[i] <= self.threshold:
+                    return None
+                if self._matches(self._entries[i], entities, context):
+                    break
+            else:
+                return None
+            # LRU: move the hit to the end so it is evicted last
+            entry = self._entries.pop(int(i))
+            self._entries.append(entry)
+            self._matrix = None
+            return copy.deepcopy(entry.response)
+
+    def put(self, embedding: np.ndarray, response: dict, entities: frozenset = frozenset(),
+            context: frozenset = frozenset()):
+        with self._lock:
+            self._drop_expired()
+            entry = CacheEntry(embedding, copy.deepcopy(response), time.time(), entities, context)
+            self._entries.append(entry)
+            del self._entries[:-self.max_entries]
+            self._matrix = None
+            self.backend.add(entry, self.ttl, self.max_entries)
+
+
+def make_semantic_cache() -> SemanticCache:
+    """Build the cache used by backend.py: Redis-backed when REDIS_URL is set, in-memory otherwise."""
+    url = os.getenv("REDIS_URL")
+    if url:
+        try:
+            return SemanticCache(RedisBackend(url))
+        except ImportError:
+            print("[warning] REDIS_URL is set but the redis package is not installed; using in-memory cache.")
+    return SemanticCache()
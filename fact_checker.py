@@ -1,57 +1,314 @@
 import os
+import re
 import json
-import requests
-from googlesearch import search
-from bs4 import BeautifulSoup
+import codecs
+import asyncio
+import functools
+import importlib.util
 from dotenv import load_dotenv
 
-
-# Use Google Gen AI SDK (Gemini)
-import google.generativeai as genai
+# Heavy dependencies (google.generativeai, googlesearch, bs4/selectolax, requests, aiohttp,
+# diskcache, datasketch, numpy, pydantic) are imported on first use, so importing this module
+# (e.g. on Streamlit's first render or for a cached claim) doesn't pay for them.
 
 # Load environment variables from .env
 load_dotenv()
 
-# Support two common env names: GEMINI_API_KEY (preferred) or OPENAI_API_KEY (if you previously used OpenAI)
-gemini_key = os.getenv("GEMINI_API_KEY") 
-if gemini_key:
-    # Ensure environment variable is set for the client (the SDK looks for GEMINI_API_KEY by default)
-    os.environ["GEMINI_API_KEY"] = gemini_key
-else:
-    raise RuntimeError("No API key found. Please set GEMINI_API_KEY in your .env (or OPENAI_API_KEY as fallback).")
+@functools.lru_cache(None)
+def get_genai():
+    """Import and configure the Google Gen AI SDK (Gemini) on first use.
+       Raises RuntimeError if no API key is set (and retries on the next call).
+    """
+    import google.generativeai as genai
 
-# Create the Gemini client (the client will read GEMINI_API_KEY from the environment).
-genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    # Support two common env names: GEMINI_API_KEY (preferred) or OPENAI_API_KEY (if you previously used OpenAI)
+    gemini_key = os.getenv("GEMINI_API_KEY")
+    if gemini_key:
+        # Ensure environment variable is set for the client (the SDK looks for GEMINI_API_KEY by default)
+        os.environ["GEMINI_API_KEY"] = gemini_key
+    else:
+        raise RuntimeError("No API key found. Please set GEMINI_API_KEY in your .env (or OPENAI_API_KEY as fallback).")
+
+    # Create the Gemini client (the client will read GEMINI_API_KEY from the environment).
+    genai.configure(api_key=os.getenv("GEMINI_API_KEY"))
+    return genai
+
+# Concurrent page fetching (aiohttp) can be turned off with FACT_CHECKER_ASYNC_FETCH=0;
+# the sequential path then goes through a shared session so connections to the same
+# host (the site: filter keeps hitting the same few domains) are kept alive and reused.
+USE_ASYNC_FETCH = (importlib.util.find_spec("aiohttp") is not None
+                   and os.getenv("FACT_CHECKER_ASYNC_FETCH", "1") != "0")
+
+@functools.lru_cache(None)
+def _session():
+    import requests
+    from requests.adapters import HTTPAdapter
+    from urllib3.util.retry import Retry
+
+    session = requests.Session()
+    session.headers.update({"User-Agent": "Mozilla/5.0"})
+    adapter = HTTPAdapter(pool_connections=10, pool_maxsize=20,
+                          max_retries=Retry(total=1, backoff_factor=0.2))
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+# Restrict evidence search to fact-checking / news sites
+SITE_FILTER = " site:snopes.com OR site:politifact.com OR site:bbc.com OR site:reuters.com"
+
+def build_query(claim):
+    return claim + SITE_FILTER
+
+# Search result URLs per (query, num_results), kept on disk for an hour. Google SERP scraping
+# is slow and rate-limited; SQLite-backed diskcache is safe across Streamlit threads/reruns.
+_SEARCH_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), ".search_cache")
+
+@functools.lru_cache(None)
+def _search_cache():
+    import diskcache
+    return diskcache.Cache(_SEARCH_CACHE_DIR)
+
+def _cached_search(query, num_results):
+    cache = _search_cache()
+    key = ("search", query, num_results)
+    urls = cache.get(key)
+    if urls is None:
+        from googlesearch import search
+        urls = list(search(query, num_results=num_results))
+        # googlesearch returns [] without raising on consent/captcha pages; don't pin that for an hour
+        if urls:
+            cache.set(key, urls, expire=3600)
+    return urls
+
+@functools.lru_cache(None)
+def _html_parser():
+    """Snippet extraction prefers the C-backed parsers: selectolax, then BeautifulSoup on lxml."""
+    try:
+        import selectolax.lexbor  # noqa: F401 (the older selectolax.parser backend is gone in 1.0)
+        return "selectolax"
+    except ImportError:
+        pass
+    try:
+        import lxml  # noqa: F401 (only checked so BeautifulSoup can use it)
+        return "lxml"
+    except ImportError:
+        return "html.parser"
+
+# Tags _PageReader tracks to find safe places to split a page: paragraph ends, and the
+# starts/ends of blocks whose content is not body markup
+_SPLIT_TOKEN = re.compile(r"</p\s*>|<!--|-->|<(/?)(script|style|template)\b", re.IGNORECASE)
+_SPLIT_TOKEN_MAX = 16  # longest token we expect to match (allows a few spaces in "</p  >")
+
+def _paragraph_text(html):
+    """Join the <p> text of a (possibly partial) page."""
+    parser = _html_parser()
+    if parser == "selectolax":
+        from selectolax.lexbor import LexborHTMLParser
+        tree = LexborHTMLParser(html)
+        return " ".join(node.text(separator=" ", strip=True) for node in tree.css("p"))
+    from bs4 import BeautifulSoup
+    soup = BeautifulSoup(html, parser)
+    return " ".join([p.get_text(separator=" ", strip=True) for p in soup.find_all("p")])
+
+class _PageReader:
+    """Collects a page as it downloads so the download can stop as soon as there is
+       enough <p> text for a snippet (2 * char_limit) instead of reading megabytes of
+       markup that would be truncated away anyway. Markup is parsed once, in pieces
+       that end at a closing </p> outside any <script>/<style>/<template> or comment,
+       so a long page isn't re-parsed for every chunk.
+    """
+
+    def __init__(self, encoding, char_limit):
+        try:
+            self._decoder = codecs.getincrementaldecoder(encoding or "utf-8")(errors="replace")
+        except LookupError:
+            self._decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+        self.char_limit = char_limit
+        self.done = False
+        self._pending = []   # decoded chunks after the last split, not parsed yet
+        self._pending_len = 0
+        self._carry = ""     # end of the pending markup not scanned yet (a token may be split there)
+        self._raw = None     # "-->" or the tag name while inside a comment/script/style/template
+        self._parts = []     # paragraph text of the pieces parsed so far
+        self._length = 0
+
+    def _parse(self, html):
+        text = _paragraph_text(html)
+        if text:
+            self._parts.append(text)
+            self._length += len(text) + 1
+
+    def _find_split(self, text):
+        """Scan `text` for tokens, updating self._raw; returns the end of the last </p>
+           outside raw content (or None) and where the next scan should resume.
+        """
+        split = None
+        resume = max(0, len(text) - _SPLIT_TOKEN_MAX)
+        for match in _SPLIT_TOKEN.finditer(text):
+            if match.start() >= resume:
+                break  # might be a prefix of a longer token; look again with more data
+            token = match.group(0).lower()
+            if self._raw is None:
+                if token == "<!--":
+                    self._raw = "-->"
+                elif match.group(2) and not match.group(1):
+                    self._raw = match.group(2).lower()
+                elif token.startswith("</p"):
+                    split = match.end()
+            elif self._raw == "-->" and token == "-->":
+                self._raw = None
+            elif match.group(1) and match.group(2) and match.group(2).lower() == self._raw:
+                self._raw = None
+            resume = max(resume, match.end())
+        return split, resume
+
+    def feed(self, data):
+        """Add a downloaded chunk; returns True (and sets .done) once enough text has arrived."""
+        chunk = self._decoder.decode(data)
+        text = self._carry + chunk
+        split, resume = self._find_split(text)
+        self._carry = text[resume:]
+        self._pending.append(chunk)
+        self._pending_len += len(chunk)
+        if split is not None:
+            html = "".join(self._pending)
+            split += self._pending_len - len(text)  # offset of `text` within the pending markup
+            self._parse(html[:split])
+            self._pending = [html[split:]]
+            self._pending_len = len(self._pending[0])
+            self.done = self._length >= 2 * self.char_limit
+        return self.done
+
+    def text(self):
+        """Snippet text truncated to char_limit (parses whatever arrived if not done)."""
+        if not self.done:
+            self._parse("".join(self._pending) + self._decoder.decode(b"", final=True))
+            self._pending, self._pending_len, self._carry = [], 0, ""
+        return " ".join(self._parts)[:self.char_limit]
+
+async def _fetch(session, semaphore, url, char_limit):
+    """Fetch one result page and return its paragraph text as a snippet dict (or None)."""
+    import aiohttp
+
+    async with semaphore:
+        try:
+            async with session.get(url) as r:
+                r.raise_for_status()
+                page = _PageReader(r.charset, char_limit)
+                async for data in r.content.iter_chunked(8192):
+                    if page.feed(data):
+                        break
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            # Print a small warning but continue with other results
+            print(f"[warning] Error fetching {url}: {e}")
+            return None
+    text = page.text()
+    return {"url": url, "text": text} if text else None
+
+async def _fetch_all(urls, char_limit=1000):
+    """Fetch all result pages concurrently over one shared connection pool."""
+    import aiohttp
+
+    semaphore = asyncio.Semaphore(10)
+    connector = aiohttp.TCPConnector(limit=20)
+    timeout = aiohttp.ClientTimeout(total=7)
+    async with aiohttp.ClientSession(connector=connector, timeout=timeout,
+                                     headers={"User-Agent": "Mozilla/5.0"}) as session:
+        results = await asyncio.gather(*[_fetch(session, semaphore, u, char_limit) for u in urls])
+    # gather keeps the search ranking order; drop pages that failed or had no text
+    return [s for s in results if s]
+
+def _fetch_sequential(urls, char_limit=1000):
+    """Fetch result pages one by one over the pooled session (used when async fetching is off)."""
+    import requests
 
-def get_web_snippets(query, num_results=5, char_limit=1000):
-    """Search and scrape short text snippets from result pages."""
     snippets = []
-    for url in search(query, num_results=num_results):
+    for url in urls:
         try:
-            r = requests.get(url, timeout=7, headers={"User-Agent": "Mozilla/5.0"})
-            r.raise_for_status()
-            soup = BeautifulSoup(r.text, "html.parser")
-            text = " ".join([p.get_text(separator=" ", strip=True) for p in soup.find_all("p")])
+            with _session().get(url, timeout=7, stream=True) as r:
+                r.raise_for_status()
+                page = _PageReader(r.encoding, char_limit)
+                for data in r.iter_content(chunk_size=8192):
+                    if page.feed(data):
+                        break
+            text = page.text()
             if text:
-                snippets.append({"url": url, "text": text[:char_limit]})
+                snippets.append({"url": url, "text": text})
         except requests.RequestException as e:
             # Print a small warning but continue with other results
             print(f"[warning] Error fetching {url}: {e}")
     return snippets
 
-def verify_claim(claim, snippets, model="gemini-2.5-flash"):
-    """Ask Gemini to judge the claim based on the collected evidence.
-       Returns a Python dict parsed from the model's JSON reply (if possible),
-       otherwise returns raw text under 'raw_response'.
+async def get_web_snippets_async(query, num_results=5, char_limit=1000):
+    """Awaitable get_web_snippets, for callers that already run inside an event loop."""
+    # googlesearch is blocking; keep it off the event loop
+    urls = await asyncio.to_thread(_cached_search, query, num_results)
+    if USE_ASYNC_FETCH:
+        return await _fetch_all(urls, char_limit=char_limit)
+    return await asyncio.to_thread(_fetch_sequential, urls, char_limit)
+
+def get_web_snippets(query, num_results=5, char_limit=1000):
+    """Search and scrape short text snippets from result pages."""
+    return asyncio.run(get_web_snippets_async(query, num_results=num_results, char_limit=char_limit))
+
+def dedupe_snippets(snippets, threshold=0.7, num_perm=64):
+    """Drop near-duplicate snippets (syndicated copies of the same article) so they aren't
+       sent to Gemini twice. Keeps the first, i.e. best-ranked, copy of each.
     """
-    # Build a compact context from snippets
-    context = "\n".join([f"{i+1}) {s['text']}\nSource: {s['url']}" for i, s in enumerate(snippets)])
-    # Prompt asking for JSON output (the model often follows this but we handle parsing defensively)
-    prompt = f"""
+    try:
+        from datasketch import MinHash, MinHashLSH
+    except ImportError:  # fall back to exact prefix matching
+        seen, unique = set(), []
+        for s in snippets:
+            key = s["text"][:200]
+            if key not in seen:
+                seen.add(key)
+                unique.append(s)
+        return unique
+
+    lsh = MinHashLSH(threshold=threshold, num_perm=num_perm)
+    unique = []
+    for i, s in enumerate(snippets):
+        words = s["text"].lower().split()
+        shingles = {" ".join(words[j:j + 5]) for j in range(max(len(words) - 4, 1))}
+        m = MinHash(num_perm=num_perm)
+        for sh in shingles:
+            m.update(sh.encode("utf-8"))
+        if lsh.query(m):
+            continue
+        lsh.insert(str(i), m)
+        unique.append(s)
+    return unique
+
+# GenerativeModel instances by model name, built once and shared across calls/threads
+_MODELS = {}
+
+def _get_model(name):
+    gen_model = _MODELS.get(name)
+    if gen_model is None:
+        # setdefault is atomic in CPython: concurrent first calls all end up with one instance
+        gen_model = _MODELS.setdefault(name, get_genai().GenerativeModel(name))
+    return gen_model
+
+def embed_text(text, task_type="semantic_similarity", model="models/text-embedding-004"):
+    """Embed text with Gemini and return it as an L2-normalized float32 vector,
+       so that a plain dot product between two vectors is their cosine similarity.
+    """
+    import numpy as np
+
+    res = get_genai().embed_content(model=model, content=text, task_type=task_type)
+    vec = np.asarray(res["embedding"], dtype=np.float32)
+    norm = np.linalg.norm(vec)
+    return vec / norm if norm else vec
+
+# Constant parts of the verification prompt; only the claim and evidence are filled in per call.
+_PROMPT_HEAD = """
 You are a fact-checking assistant.
-Claim: "{claim}"
+Claim: \""""
+_PROMPT_EVIDENCE = """"
 Evidence:
-{context}
+"""
+_PROMPT_TAIL = """
 
 Task:
 1. Decide if the claim is SUPPORTED, REFUTED, or NOT ENOUGH INFO based only on the evidence.
@@ -60,72 +317,265 @@ Task:
 
 Respond ONLY in JSON with keys: "verdict", "explanation", "confidence", "sources".
 Example:
-{{"verdict":"SUPPORTED","explanation":"...","confidence":85,"sources":["https://...","https://..."]}}
+{"verdict":"SUPPORTED","explanation":"...","confidence":85,"sources":["https://...","https://..."]}
 """
 
+def _build_prompt(claim, snippets):
+    # Build a compact context from snippets
+    context = "\n".join([f"{i+1}) {s['text']}\nSource: {s['url']}" for i, s in enumerate(snippets)])
+    return "".join((_PROMPT_HEAD, claim, _PROMPT_EVIDENCE, context, _PROMPT_TAIL))
+
+@functools.lru_cache(None)
+def _schemas():
+    """Pydantic models for Gemini's JSON replies, built on first use.
+       Returns (Verdict, Judgement): the verification reply and one per-snippet judgement.
+    """
+    from typing import Literal
+    from pydantic import BaseModel
+
+    class Verdict(BaseModel):
+        verdict: Literal["SUPPORTED", "REFUTED", "NOT ENOUGH INFO"]
+        explanation: str
+        confidence: int
+        sources: list[str]
+
+    class Judgement(BaseModel):
+        label: Literal["SUPPORT", "REFUTE", "NONE"]
+        weight: float  # 0-1; clamped after validation since the SDK's Schema has no minimum/maximum
+        reason: str
+
+    return Verdict, Judgement
+
+def _json_config(schema):
+    # JSON mode + schema: the SDK only returns JSON matching the model, so no repair is needed
+    return {"response_mime_type": "application/json", "response_schema": schema}
+
+def _parse_verdict(model_text):
+    """Validate the model's JSON reply, or return the raw text under 'raw_response'."""
+    from pydantic import ValidationError
+
+    verdict_model = _schemas()[0]
+    try:
+        return verdict_model.model_validate_json(model_text).model_dump()
+    except ValidationError:
+        return {"raw_response": model_text.strip()}
+
+_JSON_ESCAPES = {"n": "\n", "t": "\t", "r": "\r", "b": "\b", "f": "\f"}
+
+class _PartialJson:
+    """Accumulates a streamed JSON reply and decodes the top-level "explanation" string as
+       its characters arrive. Scanner state is kept between feeds, so each character is
+       looked at once no matter how many chunks arrive; the full reply is only parsed once,
+       at the end (see _parse_verdict).
+    """
+
+    def __init__(self):
+        self.text = ""          # everything received, including any prose/fences around the JSON
+        self._start = -1        # index of the first "{" in text
+        self._pos = 0           # how far the scanner has got
+        self._stack = []        # closers for currently open {/[
+        self._in_string = False
+        self._escape = False
+        self._hex = None        # digits of a \uXXXX escape in progress
+        self._high = None       # pending high surrogate of a \uXXXX pair
+        self._expect_key = False
+        self._key = None        # characters of the object key being read
+        self._last_key = None
+        self._capture = False   # inside the top-level "explanation" value
+        self._explanation = []  # decoded explanation characters not yet taken
+
+    def _emit(self, ch):
+        if self._key is not None:
+            self._key.append(ch)
+        elif self._capture:
+            self._explanation.append(ch)
+
+    def _emit_code(self, code):
+        if 0xD800 <= code < 0xDC00:
+            self._high = code
+            return
+        if 0xDC00 <= code < 0xE000 and self._high is not None:
+            code = 0x10000 + ((self._high - 0xD800) << 10) + (code - 0xDC00)
+        self._high = None
+        self._emit(chr(code))
+
+    def feed(self, chunk):
+        self.text += chunk
+        if self._start == -1:
+            self._start = self.text.find("{")
+            if self._start == -1:
+                return
+            self._pos = self._start
+        for ch in self.text[self._pos:]:
+            if self._in_string:
+                if self._hex is not None:
+                    self._hex += ch
+                    if len(self._hex) == 4:
+                        try:
+                            self._emit_code(int(self._hex, 16))
+                        except ValueError:
+                            pass  # malformed escape; _parse_verdict will report the reply as raw
+                        self._hex = None
+                elif self._escape:
+                    self._escape = False
+                    if ch == "u":
+                        self._hex = ""
+                    else:
+                        self._emit(_JSON_ESCAPES.get(ch, ch))
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    self._capture = False
+                    if self._key is not None:
+                        self._last_key = "".join(self._key)
+                        self._key = None
+                else:
+                    self._emit(ch)
+            elif ch == '"':
+                self._in_string = True
+                if self._expect_key:
+                    self._key = []
+                else:
+                    self._capture = self._stack == ["}"] and self._last_key == "explanation"
+            elif ch in "{[":
+                self._stack.append("}" if ch == "{" else "]")
+                self._expect_key = ch == "{"
+            elif ch in "}]":
+                if self._stack:
+                    self._stack.pop()
+                self._expect_key = False
+            elif ch == ",":
+                self._expect_key = self._stack[-1:] == ["}"]
+            elif ch == ":":
+                self._expect_key = False
+        self._pos = len(self.text)
+
+    def take_explanation(self):
+        """Explanation text decoded since the previous call ("" if there is none yet)."""
+        new = "".join(self._explanation)
+        self._explanation.clear()
+        return new
+
+def verify_claim(claim, snippets, model="gemini-2.5-flash"):
+    """Ask Gemini to judge the claim based on the collected evidence.
+       Returns the model's JSON reply as a dict (see _schemas), or the raw text
+       under 'raw_response' if it doesn't validate.
+    """
+    prompt = _build_prompt(claim, snippets)
+
     try:
         # Use the Google Gen AI SDK to generate content from the chosen Gemini model.
         # (Quickstart example uses client.models.generate_content(...)). :contentReference[oaicite:1]{index=1}
-        resp = genai.GenerativeModel(model).generate_content(prompt)
+        resp = _get_model(model).generate_content(prompt, generation_config=_json_config(_schemas()[0]))
+        # `.text` raises ValueError when the reply has no text (e.g. blocked by safety filters)
+        return _parse_verdict(resp.text)
     except Exception as e:
         return {"error": f"API request failed: {e}"}
-    
-    # The SDK exposes response.text() style helpers; many examples show reading `.text` or `.response`:
-    # We'll try a few common places for returned text.
-    model_text = None
-    # 1) Some SDK responses expose `.text` property:
+
+async def verify_claim_stream(claim, snippets, model="gemini-2.5-flash", result=None):
+    """Streaming verify_claim: an async generator that yields the explanation text as
+       Gemini produces it. Once exhausted, `result` (if given) holds the same dict
+       verify_claim would have returned.
+    """
+    if result is None:
+        result = {}
+    prompt = _build_prompt(claim, snippets)
+    parser = _PartialJson()
+
     try:
-        model_text = resp.text
-    except Exception:
-        pass
+        resp = await _get_model(model).generate_content_async(
+            prompt, generation_config=_json_config(_schemas()[0]), stream=True)
+        async for chunk in resp:
+            try:
+                parser.feed(chunk.text)
+            except ValueError:
+                # chunk without text parts (e.g. a trailing finish/safety chunk)
+                continue
+            delta = parser.take_explanation()
+            if delta:
+                yield delta
+    except Exception as e:
+        result.update({"error": f"API request failed: {e}"})
+        return
 
-    # 2) Some responses keep candidates/parts (fallback)
-    if not model_text:
-        try:
-            # resp.candidates -> first candidate -> content -> parts -> first part -> text
-            cand = getattr(resp, "candidates", None)
-            if cand and len(cand) > 0:
-                part = cand[0].content.get("parts", [{}])[0]
-                model_text = part.get("text") if isinstance(part, dict) else None
-        except Exception:
-            model_text = None
-
-    # 3) As a last fallback, convert full resp to string
-    if not model_text:
-        try:
-            model_text = str(resp)
-        except Exception:
-            model_text = ""
+    if not parser.text:
+        # every chunk lacked text (blocked or empty reply); same outcome as verify_claim's `.text`
+        result.update({"error": "API request failed: the model returned no text."})
+        return
+    result.update(_parse_verdict(parser.text))
+
+# Per-snippet judging (map step of verify_claim_parallel)
+_JUDGE_PROMPT = """
+You are a fact-checking assistant.
+Claim: "{claim}"
+Evidence ({url}):
+{text}
+
+Does this evidence SUPPORT the claim, REFUTE it, or say nothing about it (NONE)?
+Reply in JSON: "label" (SUPPORT, REFUTE or NONE), "weight" (how sure you are, 0 to 1)
+and "reason" (one sentence).
+"""
 
-    model_text = model_text.strip()
+_LABEL_VERDICTS = {"SUPPORT": "SUPPORTED", "REFUTE": "REFUTED", "NONE": "NOT ENOUGH INFO"}
 
-    # Try to parse JSON returned by the model
+async def _judge_one(gen_model, claim, snippet):
+    """Ask Gemini about a single snippet; returns None if the call fails."""
+    prompt = _JUDGE_PROMPT.format(claim=claim, url=snippet["url"], text=snippet["text"])
     try:
-        parsed = json.loads(model_text)
-        return parsed
-    except json.JSONDecodeError:
-        # Model didn't return strict JSON — try to extract a JSON substring
-        start = model_text.find("{")
-        end = model_text.rfind("}")
-        if start != -1 and end != -1 and end > start:
-            maybe_json = model_text[start:end+1]
-            try:
-                return json.loads(maybe_json)
-            except json.JSONDecodeError:
-                pass
+        judgement_model = _schemas()[1]
+        resp = await gen_model.generate_content_async(prompt, generation_config=_json_config(judgement_model))
+        judgement = judgement_model.model_validate_json(resp.text)
+    except Exception as e:
+        print(f"[warning] Could not judge {snippet['url']}: {e}")
+        return None
+    return {**judgement.model_dump(), "weight": min(max(judgement.weight, 0.0), 1.0), "url": snippet["url"]}
+
+async def verify_claim_parallel(claim, snippets, model="gemini-2.5-flash"):
+    """Map-reduce alternative to verify_claim: one small Gemini call per snippet, all in
+       parallel, then a weighted majority vote. Wall time is roughly that of the slowest
+       single call. Returns the same dict shape as verify_claim.
+    """
+    gen_model = _get_model(model)
+    judged = await asyncio.gather(*[_judge_one(gen_model, claim, s) for s in snippets])
+    judged = [j for j in judged if j is not None]
+    if not judged:
+        return {"error": "API request failed for every evidence snippet."}
+
+    totals = {label: 0.0 for label in _LABEL_VERDICTS}
+    for j in judged:
+        totals[j["label"]] += j["weight"]
+    top = max(totals.values())
+    leaders = [label for label, weight in totals.items() if weight == top]
+    # A tie for the top weight (including all-zero weights) is not enough info either way;
+    # the explanation and sources then come from all the tied labels
+    label = leaders[0] if len(leaders) == 1 else "NONE"
+    total = sum(totals.values())
+    backing = [j for j in judged if j["label"] in leaders]
 
-    # If parsing fails, return the raw text so the caller can inspect it
-    return {"raw_response": model_text}
+    if len(leaders) == 1:
+        head = f"{len(backing)} of {len(judged)} sources"
+    elif top:
+        head = "Sources disagree"
+    else:
+        head = "No source was confident either way"
+    reasons = " ".join(j["reason"] for j in backing if j["reason"])
+    return {
+        "verdict": _LABEL_VERDICTS[label],
+        "explanation": f"{head}: {reasons}" if reasons else f"{head}.",
+        "confidence": round(100 * sum(totals[l] for l in leaders) / total) if total else 0,
+        "sources": [j["url"] for j in backing],
+    }
 
 if __name__ == "__main__":
+    get_genai()  # fail fast if no API key is configured
     claim = input("Enter a claim to check: ").strip()
     if not claim:
         print("No claim entered; exiting.")
         raise SystemExit(1)
 
     print("\nSearching for evidence...")
-    search_query = f'{claim} site:snopes.com OR site:politifact.com OR site:bbc.com OR site:reuters.com'
-    snippets = get_web_snippets(search_query, num_results=6)
+    snippets = dedupe_snippets(get_web_snippets(build_query(claim), num_results=6))
 
     if not snippets:
         print("No evidence found.")
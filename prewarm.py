@@ -0,0 +1,109 @@
+# prewarm.py
+"""Builds a local evidence index from Wikipedia so common claims can skip search + scraping.
+
+Its dependencies are optional and not in requirements.txt. Install them and run once
+(and whenever TOPICS changes):
+    pip install -r requirements-prewarm.txt
+    python prewarm.py
+
+backend.py then checks every new claim against the index and, when a chunk is close
+enough, hands the Wikipedia chunks to verify_claim instead of calling get_web_snippets.
+That lookup needs faiss-cpu at runtime; without the index (or faiss) it is skipped.
+"""
+import json
+import os
+
+INDEX_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "wiki_index")
+INDEX_FILE = os.path.join(INDEX_DIR, "index.faiss")
+CHUNKS_FILE = os.path.join(INDEX_DIR, "chunks.json")
+
+# High-frequency topics for the demo (see the sidebar examples in tiny_fact_checker_streamlit.py)
+TOPICS = [
+    "Eiffel Tower",
+    "Paris",
+    "France",
+    "Moon",
+    "India",
+    "Demographics of India",
+    "Population",
+    "COVID-19 vaccine",
+    "COVID-19 misinformation",
+    "Vaccine",
+    "Drinking water",
+    "Headache",
+    "Great Wall of China",
+    "Mount Everest",
+    "Climate change",
+    "Earth",
+    "Solar System",
+    "United States",
+    "World War II",
+    "Albert Einstein",
+]
+
+def build_index(topics=TOPICS, chunk_size=2000, chunk_overlap=200):
+    """Download the topic articles, split them into ~500-token chunks, embed and save them."""
+    import faiss
+    import numpy as np
+    import wikipedia
+    from langchain_text_splitters import RecursiveCharacterTextSplitter
+    from fact_checker import embed_text
+
+    splitter = RecursiveCharacterTextSplitter(chunk_size=chunk_size, chunk_overlap=chunk_overlap)
+    chunks, vectors = [], []
+    for topic in topics:
+        try:
+            page = wikipedia.page(topic, auto_suggest=False)
+        except Exception as e:
+            print(f"[warning] Skipping {topic!r}: {e}")
+            continue
+        for text in splitter.split_text(page.content):
+            try:
+                vectors.append(embed_text(text))
+            except Exception as e:
+                print(f"[warning] Could not embed a chunk of {topic!r}: {e}")
+                continue
+            chunks.append({"url": page.url, "text": text, "source": "Wikipedia"})
+        print(f"{topic}: {len(chunks)} chunks so far")
+
+    if not chunks:
+        raise SystemExit("No chunks were indexed.")
+
+    # Embeddings are L2-normalized, so inner product == cosine similarity
+    matrix = np.vstack(vectors).astype(np.float32)
+    index = faiss.IndexFlatIP(matrix.shape[1])
+    index.add(matrix)
+
+    os.makedirs(INDEX_DIR, exist_ok=True)
+    faiss.write_index(index, INDEX_FILE)
+    with open(CHUNKS_FILE, "w", encoding="utf-8") as f:
+        json.dump(chunks, f)
+    print(f"Saved {len(chunks)} chunks to {INDEX_DIR}")
+
+def load_index():
+    """Return (faiss_index, chunks), or None if the index hasn't been built or faiss is missing."""
+    if not (os.path.exists(INDEX_FILE) and os.path.exists(CHUNKS_FILE)):
+        return None
+    try:
+        import faiss
+    except ImportError:
+        print("[warning] wiki_index exists but faiss is not installed; skipping it.")
+        return None
+    with open(CHUNKS_FILE, encoding="utf-8") as f:
+        chunks = json.load(f)
+    return faiss.read_index(INDEX_FILE), chunks
+
+def wiki_snippets(loaded, embedding, k=5, threshold=0.82):
+    """Top-k Wikipedia chunks for a claim embedding, or [] if none is similar enough."""
+    if loaded is None or embedding is None:
+        return []
+    import numpy as np
+
+    index, chunks = loaded
+    scores, ids = index.search(embedding.reshape(1, -1).astype(np.float32), k)
+    if scores[0][0] <= threshold:
+        return []
+    return [chunks[i] for i in ids[0] if i != -1]
+
+if __name__ == "__main__":
+    build_index()
@@ -1,24 +1,30 @@
+import asyncio
+import csv
+import io
+import json
 import streamlit as st
-import pandas as pd
-import time
 from datetime import datetime
 
 st.set_page_config(page_title="Tiny Fact Checker", layout="wide", page_icon="🕵️‍♂️")
 
 # --- Helper: try to import user's backend ---
-def call_backend(statement: str):
-    """Tries to call a backend.check_fact function if available.
+def call_backend(statement: str, context=()):
+    """Tries to call a backend.check_fact_async / check_fact function if available.
     If not found, returns a mock response useful for UI testing.
     """
     try:
         import backend
+        if hasattr(backend, 'check_fact_async'):
+            return asyncio.run(backend.check_fact_async(statement, context))
         if hasattr(backend, 'check_fact'):
-            return backend.check_fact(statement)
+            return backend.check_fact(statement, context)
     except Exception:
         # fallthrough to mock
         pass
+    return demo_response(statement)
 
-    # Mock response (UI/demo mode)
+def demo_response(statement: str):
+    """Mock response (UI/demo mode) used when the real backend can't be reached."""
     mock = {
         "verdict": "Unclear",
         "confidence": 0.64,
@@ -46,11 +52,57 @@ def call_backend(statement: str):
         mock['summary'] = 'Short demo: statement seems plausible.'
     return mock
 
+def stream_backend(statement: str, result: dict, context=()):
+    """Returns an async generator of summary text for st.write_stream, filling `result`
+    with the final dict once it is exhausted. Uses backend.check_fact_stream when
+    available, otherwise wraps call_backend (and its demo mock).
+    """
+    try:
+        import backend
+        if hasattr(backend, 'check_fact_stream'):
+            async def guarded():
+                try:
+                    async for text in backend.check_fact_stream(statement, result, context):
+                        yield text
+                except Exception:
+                    # same as call_backend: fall back to the demo response
+                    result.clear()
+                    result.update(demo_response(statement))
+                    yield result['summary']
+            return guarded()
+    except Exception:
+        # fallthrough to call_backend
+        pass
+
+    async def single_chunk():
+        result.update(call_backend(statement, context))
+        yield result.get('summary', '')
+    return single_chunk()
+
+async def smooth(gen):
+    """Re-chunks oversized stream pieces (Gemini sometimes sends the whole explanation in
+    one go) into 4-char pieces every 20 ms so the text still appears progressively.
+    The pause shrinks for long pieces so smoothing never adds more than ~200 ms.
+    """
+    async for ch in gen:
+        if len(ch) > 50:
+            pieces = range(0, len(ch), 4)
+            delay = min(0.02, 0.2 / len(pieces))
+            for i in pieces:
+                yield ch[i:i + 4]
+                await asyncio.sleep(delay)
+        else:
+            yield ch
+
 # --- Session state for history ---
 if 'history' not in st.session_state:
     st.session_state.history = []
 if 'statement' not in st.session_state:
     st.session_state.statement = ""
+# Last 3 claims checked in this session, most recent first. The backend only reuses a cached
+# result for a follow-up claim ("The vaccine is safe") when it was asked in a matching context.
+if 'context_chain' not in st.session_state:
+    st.session_state.context_chain = []
 
 # --- CSS tweaks for nicer look ---
 st.markdown(
@@ -116,14 +168,18 @@ with clear_col:
 if clear:
     st.session_state.history = []
     st.session_state.statement = ""
+    st.session_state.context_chain = []
     st.rerun()
 
 # When user checks
 if check and statement.strip():
     with st.spinner("Checking claim..."):
-        # small UX delay
-        time.sleep(0.6)
-        result = call_backend(statement)
+        # show the explanation as it is generated, then replace it with the full result below
+        result = {}
+        live = st.empty()
+        live.write_stream(smooth(stream_backend(statement, result, st.session_state.context_chain)))
+        live.empty()
+        st.session_state.context_chain = [statement] + st.session_state.context_chain[:2]
         # normalize keys
         verdict = result.get('verdict', 'Unclear')
         confidence = float(result.get('confidence', 0.0))
@@ -161,7 +217,7 @@ if check and statement.strip():
         st.markdown("### Confidence")
         st.progress(int(confidence*100))
         st.markdown("\n---\n### Quick actions")
-        st.download_button("Download result JSON", data=pd.Series([result]).to_json(orient='records'), file_name='fact_check_result.json')
+        st.download_button("Download result JSON", data=json.dumps([result]), file_name='fact_check_result.json')
         st.write("\n")
         st.button("Report problem")
 
@@ -180,12 +236,14 @@ with hist_col:
 with log_col:
     st.subheader("Analysis log / export")
     if st.session_state.history:
-        df = pd.DataFrame(st.session_state.history)
-        df_display = df.copy()
+        history = st.session_state.history
         # show human-friendly time
-        df_display['time'] = pd.to_datetime(df_display['time']).dt.tz_localize(None)
-        st.dataframe(df_display)
-        st.download_button("Download CSV", df.to_csv(index=False), file_name='fact_checks.csv')
+        st.dataframe([{**h, 'time': datetime.fromisoformat(h['time'].rstrip('Z'))} for h in history])
+        buf = io.StringIO()
+        writer = csv.DictWriter(buf, fieldnames=list(history[0].keys()))
+        writer.writeheader()
+        writer.writerows(history)
+        st.download_button("Download CSV", buf.getvalue(), file_name='fact_checks.csv')
     else:
         st.write("Nothing to show yet.")
 